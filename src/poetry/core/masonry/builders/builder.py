@@ -44,6 +44,7 @@ class Builder:
         self._package = poetry.package
         self._path: Path = poetry.pyproject_path.parent
         self._excluded_files: set[str] | None = None
+        self._excluded_dirs: dict[str, bool] = {}
         self._executable = Path(executable or sys.executable)
 
         packages = []
@@ -139,17 +140,27 @@ class Builder:
     def is_excluded(self, filepath: str | Path) -> bool:
         exclude_path = Path(filepath)
 
-        while True:
-            if exclude_path.as_posix() in self.find_excluded_files(fmt=self.format):
-                return True
+        if exclude_path.as_posix() in self.find_excluded_files(fmt=self.format):
+            return True
 
-            if len(exclude_path.parts) > 1:
-                exclude_path = exclude_path.parent
-            else:
-                break
+        if len(exclude_path.parts) > 1:
+            return self._is_excluded_dir(exclude_path.parent)
 
         return False
 
+    def _is_excluded_dir(self, dirpath: Path) -> bool:
+        # Files are mostly checked directory by directory,
+        # so remember the result for each parent instead of walking up every time.
+        key = dirpath.as_posix()
+        excluded = self._excluded_dirs.get(key)
+        if excluded is None:
+            excluded = key in self.find_excluded_files(fmt=self.format) or (
+                len(dirpath.parts) > 1 and self._is_excluded_dir(dirpath.parent)
+            )
+            self._excluded_dirs[key] = excluded
+
+        return excluded
+
     def find_files_to_add(self, exclude_build: bool = True) -> set[BuildIncludeFile]:
         """
         Finds all files to add to the tarball
@@ -162,19 +173,17 @@ class Builder:
             include.refresh()
             formats = include.formats or ["sdist"]
 
+            is_package_include = False
+            source_root = self._path
+            if isinstance(include, PackageInclude):
+                is_package_include = True
+                if include.source and self.format == "wheel":
+                    source_root = include.base
+
             for file in include.elements:
-                if "__pycache__" in str(file):
+                if "__pycache__" in file.parts:
                     continue
 
-                if (
-                    isinstance(include, PackageInclude)
-                    and include.source
-                    and self.format == "wheel"
-                ):
-                    source_root = include.base
-                else:
-                    source_root = self._path
-
                 if file.is_dir():
                     if self.format in formats:
                         for current_file in file.glob("**/*"):
@@ -197,9 +206,9 @@ class Builder:
                     path=file, project_root=self._path, source_root=source_root
                 )
 
-                if self.is_excluded(
+                if is_package_include and self.is_excluded(
                     include_file.relative_to_project_root()
-                ) and isinstance(include, PackageInclude):
+                ):
                     continue
 
                 if file.suffix == ".pyc":
@@ -13,7 +13,9 @@ import tempfile
 import zipfile
 
 from base64 import urlsafe_b64encode
-from io import StringIO
+from functools import cached_property
+from io import BytesIO
+from io import TextIOWrapper
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import TextIO
@@ -44,9 +46,50 @@ Root-Is-Purelib: {pure_lib}
 Tag: {tag}
 """
 
+# Files in these formats are already compressed,
+# deflating them again costs time without making the wheel any smaller.
+_INCOMPRESSIBLE_SUFFIXES = frozenset(
+    {
+        ".bz2",
+        ".gif",
+        ".gz",
+        ".jpeg",
+        ".jpg",
+        ".mov",
+        ".mp3",
+        ".mp4",
+        ".png",
+        ".webp",
+        ".whl",
+        ".woff",
+        ".woff2",
+        ".xz",
+        ".zip",
+        ".zst",
+    }
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _walk_files(root: Path) -> Iterator[Path]:
+    """
+    Recursively yield the files below root.
+
+    Unlike Path.glob("**/*"), this relies on the file type cached by os.scandir()
+    instead of stat'ing every entry again to skip directories.
+    Like glob, symlinks to directories are not descended into.
+    """
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif not entry.is_dir():
+                    yield Path(entry.path)
+
+
 class WheelBuilder(Builder):
     format = "wheel"
 
@@ -61,6 +104,9 @@ class WheelBuilder(Builder):
         super().__init__(poetry, executable=executable)
 
         self._records: list[tuple[str, str, int]] = []
+        # Reused for every file copied into the wheel to avoid allocating
+        # a new chunk per read.
+        self._copy_buffer = memoryview(bytearray(1024 * 1024))
         self._original_path = self._path
         if original:
             self._original_path = original.parent
@@ -103,14 +149,31 @@ class WheelBuilder(Builder):
         if not target_dir.exists():
             target_dir.mkdir()
 
-        fd, temp_path = tempfile.mkstemp(suffix=".whl")
+        # Create the temporary file next to its final destination,
+        # so that it can be renamed into place instead of being copied
+        # when the default temporary directory is on another file system.
+        # Its name is hidden and does not end in ".whl", so that a leftover
+        # from an interrupted build is never mistaken for a built wheel.
+        wheel_path = target_dir / self.wheel_filename
+        fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".whl.tmp", dir=target_dir)
 
-        st_mode = os.stat(temp_path).st_mode
-        new_mode = normalize_file_permissions(st_mode)
-        os.chmod(temp_path, new_mode)
+        try:
+            self._write_wheel(fd)
+            # mkstemp() creates the file as 600,
+            # but the wheel should be world-readable.
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, wheel_path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(temp_path)
+            raise
+
+        logger.info(f"Built {self.wheel_filename}")
+        return wheel_path
 
+    def _write_wheel(self, fd: int) -> None:
         with os.fdopen(fd, "w+b") as fd_file, zipfile.ZipFile(
-            fd_file, mode="w", compression=zipfile.ZIP_DEFLATED
+            fd_file, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True
         ) as zip_file:
             if self._editable:
                 self._build(zip_file)
@@ -133,14 +196,6 @@ class WheelBuilder(Builder):
 
             self._write_record(zip_file)
 
-        wheel_path = target_dir / self.wheel_filename
-        if wheel_path.exists():
-            wheel_path.unlink()
-        shutil.move(temp_path, str(wheel_path))
-
-        logger.info(f"Built {self.wheel_filename}")
-        return wheel_path
-
     def _add_pth(self, wheel: zipfile.ZipFile) -> None:
         paths = set()
         for include in self._module.includes:
@@ -192,13 +247,17 @@ class WheelBuilder(Builder):
 
                     lib = libs[0]
 
-                    for pkg in sorted(lib.glob("**/*")):
-                        if pkg.is_dir() or self.is_excluded(pkg):
+                    # namelist() builds a new list on every call,
+                    # so look up existing entries in the archive's index instead.
+                    existing = wheel.NameToInfo
+
+                    for pkg in sorted(_walk_files(lib)):
+                        if self.is_excluded(pkg):
                             continue
 
                         rel_path = pkg.relative_to(lib)
 
-                        if rel_path.as_posix() in wheel.namelist():
+                        if rel_path.as_posix() in existing:
                             continue
 
                         logger.debug(f"Adding: {rel_path}")
@@ -257,10 +316,19 @@ class WheelBuilder(Builder):
         with (dist_info / "METADATA").open("w", encoding="utf-8", newline="\n") as f:
             self._write_metadata_file(f)
 
-        license_files = set()
-        for base in ("COPYING", "LICENSE"):
-            license_files.add(self._path / base)
-            license_files.update(self._path.glob(base + ".*"))
+        # The bare names are always tried, so that the file system decides how
+        # they match (e.g. "license" on a case-insensitive file system).
+        # Variants with an extension are found in a single pass over the project
+        # root and compared like Path.glob() does, i.e. case-insensitively only
+        # on Windows.
+        bases = ("COPYING", "LICENSE")
+        prefixes = tuple(os.path.normcase(base + ".") for base in bases)
+
+        license_files = {self._path / base for base in bases}
+        with os.scandir(self._path) as entries:
+            for entry in entries:
+                if os.path.normcase(entry.name).startswith(prefixes):
+                    license_files.add(Path(entry.path))
 
         license_files.update(self._path.joinpath("LICENSES").glob("**/*"))
 
@@ -278,22 +346,19 @@ class WheelBuilder(Builder):
     def _write_record(self, wheel: zipfile.ZipFile) -> None:
         # Write a record of the files in the wheel
         with self._write_to_zip(wheel, self.dist_info + "/RECORD") as f:
-            record = StringIO()
-
             csv_writer = csv.writer(
-                record,
+                f,
                 delimiter=csv.excel.delimiter,
                 quotechar=csv.excel.quotechar,
                 lineterminator="\n",
             )
-            for path, hash, size in self._records:
-                csv_writer.writerow((path, f"sha256={hash}", size))
+            csv_writer.writerows(
+                (path, f"sha256={hash}", size) for path, hash, size in self._records
+            )
 
             # RECORD itself is recorded with no hash or size
             csv_writer.writerow((self.dist_info + "/RECORD", "", ""))
 
-            f.write(record.getvalue())
-
     def _copy_dist_info(self, wheel: zipfile.ZipFile, source: Path) -> None:
         dist_info = Path(self.dist_info)
         for file in sorted(source.glob("**/*")):
@@ -304,7 +369,7 @@ class WheelBuilder(Builder):
             target = dist_info / rel_path
             self._add_file(wheel, file, target)
 
-    @property
+    @cached_property
     def dist_info(self) -> str:
         return self.dist_info_name(self._package.name, self._meta.version)
 
@@ -313,7 +378,7 @@ class WheelBuilder(Builder):
         name = distribution_name(self._package.name)
         return f"{name}-{self._meta.version}.data"
 
-    @property
+    @cached_property
     def wheel_filename(self) -> str:
         name = distribution_name(self._package.name)
         version = self._meta.version
@@ -369,7 +434,7 @@ for t in packaging_tags.sys_tags():
             )
         return output.strip().splitlines()
 
-    @property
+    @cached_property
     def tag(self) -> str:
         if self._package.build_script:
             if self.executable != Path(sys.executable):
@@ -395,35 +460,49 @@ for t in packaging_tags.sys_tags():
         zinfo = zipfile.ZipInfo(rel_path_name)
 
         # Normalize permission bits to either 755 (executable) or 644
-        st_mode = full_path.stat().st_mode
+        st = full_path.stat()
+        st_mode = st.st_mode
         new_mode = normalize_file_permissions(st_mode)
         zinfo.external_attr = (new_mode & 0xFFFF) << 16  # Unix attributes
 
         if stat.S_ISDIR(st_mode):
             zinfo.external_attr |= 0x10  # MS-DOS directory flag
 
+        if rel_path.suffix.lower() in _INCOMPRESSIBLE_SUFFIXES:
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+
+        # Stream the file into the archive in a single pass, hashing each chunk
+        # on the way, so that large files are never held in memory as a whole.
+        # The expected size lets zipfile use ZIP64 only for entries that need it.
+        zinfo.file_size = st.st_size
         hashsum = hashlib.sha256()
-        with full_path.open("rb") as src:
+        size = 0
+        buf = self._copy_buffer
+        with full_path.open("rb") as src, wheel.open(zinfo, mode="w") as dst:
             while True:
-                buf = src.read(1024 * 8)
-                if not buf:
+                n = src.readinto(buf)
+                if not n:
                     break
-                hashsum.update(buf)
-
-            src.seek(0)
-            wheel.writestr(zinfo, src.read(), compress_type=zipfile.ZIP_DEFLATED)
+                chunk = buf[:n]
+                hashsum.update(chunk)
+                dst.write(chunk)
+                size += n
 
-        size = full_path.stat().st_size
-        hash_digest = urlsafe_b64encode(hashsum.digest()).decode("ascii").rstrip("=")
+        # A SHA-256 digest always encodes to 43 characters plus one "=" of padding.
+        hash_digest = urlsafe_b64encode(hashsum.digest())[:43].decode("ascii")
 
         self._records.append((rel_path_name, hash_digest, size))
 
     @contextlib.contextmanager
-    def _write_to_zip(
-        self, wheel: zipfile.ZipFile, rel_path: str
-    ) -> Iterator[StringIO]:
-        sio = StringIO()
-        yield sio
+    def _write_to_zip(self, wheel: zipfile.ZipFile, rel_path: str) -> Iterator[TextIO]:
+        # Text is encoded as it is written,
+        # so the content is not copied again when it is added to the wheel.
+        bio = BytesIO()
+        with TextIOWrapper(bio, encoding="utf-8", newline="", write_through=True) as f:
+            yield f
+            b = bio.getvalue()
 
         # The default is a fixed timestamp rather than the current time, so
         # that building a wheel twice on the same computer can automatically
@@ -431,9 +510,8 @@ for t in packaging_tags.sys_tags():
         date_time = (2016, 1, 1, 0, 0, 0)
         zi = zipfile.ZipInfo(rel_path, date_time)
         zi.external_attr = (0o644 & 0xFFFF) << 16  # Unix attributes
-        b = sio.getvalue().encode("utf-8")
         hashsum = hashlib.sha256(b)
-        hash_digest = urlsafe_b64encode(hashsum.digest()).decode("ascii").rstrip("=")
+        hash_digest = urlsafe_b64encode(hashsum.digest())[:43].decode("ascii")
 
         wheel.writestr(zi, b, compress_type=zipfile.ZIP_DEFLATED)
         self._records.append((rel_path, hash_digest, len(b)))
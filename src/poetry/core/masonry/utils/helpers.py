@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import re
 import warnings
 
@@ -15,6 +16,7 @@ if TYPE_CHECKING:
 DistributionName = NewType("DistributionName", str)
 
 
+@functools.lru_cache(maxsize=None)
 def normalize_file_permissions(st_mode: int) -> int:
     """
     Normalizes the permission bits in the st_mode field from stat to 644/755
@@ -27,6 +27,47 @@ def test_builder_find_excluded_files(mocker: MockerFixture) -> None:
     assert builder.find_excluded_files() == {"my_package/sub_pkg1/extra_file.xml"}
 
 
+def test_builder_is_excluded_checks_parent_directories(mocker: MockerFixture) -> None:
+    builder = Builder(
+        Factory().create_poetry(Path(__file__).parent / "fixtures" / "complete")
+    )
+    mocker.patch.object(
+        builder,
+        "find_excluded_files",
+        return_value={"my_package/sub_pkg1/extra_file.xml", "my_package/ignored"},
+    )
+
+    assert builder.is_excluded("my_package/sub_pkg1/extra_file.xml")
+    assert builder.is_excluded("my_package/ignored")
+    assert builder.is_excluded("my_package/ignored/foo.py")
+    assert builder.is_excluded(Path("my_package/ignored/sub/bar.py"))
+    assert not builder.is_excluded("my_package/__init__.py")
+    assert not builder.is_excluded("my_package/ignored.py")
+    assert not builder.is_excluded("my_package/sub_pkg1/__init__.py")
+
+
+def test_builder_is_excluded_caches_parent_directories(mocker: MockerFixture) -> None:
+    builder = Builder(
+        Factory().create_poetry(Path(__file__).parent / "fixtures" / "complete")
+    )
+    find_excluded_files = mocker.patch.object(
+        builder, "find_excluded_files", return_value={"my_package/ignored"}
+    )
+
+    assert builder.is_excluded("my_package/ignored/sub/foo.py")
+    lookups = find_excluded_files.call_count
+
+    # Only the file itself is looked up, its parent directory comes from the cache.
+    assert builder.is_excluded("my_package/ignored/sub/bar.py")
+    assert find_excluded_files.call_count == lookups + 1
+
+    assert not builder.is_excluded("my_package/sub_pkg1/foo.py")
+    lookups = find_excluded_files.call_count
+
+    assert not builder.is_excluded("my_package/sub_pkg1/bar.py")
+    assert find_excluded_files.call_count == lookups + 1
+
+
 @pytest.mark.xfail(
     sys.platform == "win32",
     reason="Windows is case insensitive for the most part",
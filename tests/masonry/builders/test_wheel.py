@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import csv
+import hashlib
 import os
 import re
 import shutil
+import stat
+import sys
+import tempfile
 import zipfile
 
+from base64 import urlsafe_b64encode
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Iterator
 from typing import TextIO
 
+import packaging.tags
 import pytest
 
 from poetry.core.factory import Factory
@@ -202,6 +209,60 @@ def test_dist_info_file_permissions() -> None:
         )
 
 
+def test_wheel_record_matches_file_contents() -> None:
+    module_path = fixtures_dir / "complete"
+    WheelBuilder.make(Factory().create_poetry(module_path))
+
+    whl = module_path / "dist" / "my_package-1.2.3-py3-none-any.whl"
+
+    with zipfile.ZipFile(str(whl)) as z:
+        records = z.read("my_package-1.2.3.dist-info/RECORD").decode()
+        for path, hash_, size in csv.reader(records.splitlines()):
+            if path == "my_package-1.2.3.dist-info/RECORD":
+                assert hash_ == size == ""
+                continue
+
+            content = z.read(path)
+            digest = urlsafe_b64encode(hashlib.sha256(content).digest())
+            assert hash_ == "sha256=" + digest.decode("ascii").rstrip("=")
+            assert int(size) == len(content)
+            assert z.getinfo(path).compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_wheel_does_not_use_zip64_for_small_files() -> None:
+    module_path = fixtures_dir / "complete"
+    WheelBuilder.make(Factory().create_poetry(module_path))
+
+    whl = module_path / "dist" / "my_package-1.2.3-py3-none-any.whl"
+
+    with zipfile.ZipFile(str(whl)) as z:
+        for info in z.infolist():
+            assert (info.create_version, info.extract_version) == (20, 20)
+
+
+@pytest.mark.parametrize(
+    "filename,compress_type",
+    [
+        ("module.py", zipfile.ZIP_DEFLATED),
+        ("image.png", zipfile.ZIP_STORED),
+        ("archive.tar.GZ", zipfile.ZIP_STORED),
+    ],
+)
+def test_add_file_skips_compression_of_compressed_formats(
+    filename: str, compress_type: int, tmp_path: Path
+) -> None:
+    builder = WheelBuilder(Factory().create_poetry(fixtures_dir / "module1"))
+    source = tmp_path / filename
+    source.write_bytes(b"content" * 100)
+
+    with zipfile.ZipFile(tmp_path / "test.whl", mode="w") as z:
+        builder._add_file(z, source, Path(filename))
+
+    with zipfile.ZipFile(tmp_path / "test.whl") as z:
+        assert z.getinfo(filename).compress_type == compress_type
+        assert z.read(filename) == b"content" * 100
+
+
 def test_wheel_includes_inline_table() -> None:
     module_path = fixtures_dir / "with_include_inline_table"
     WheelBuilder.make(Factory().create_poetry(module_path))
@@ -356,6 +417,49 @@ def test_wheel_file_is_closed(monkeypatch: MonkeyPatch) -> None:
     assert fd_file[0].closed
 
 
+def test_wheel_is_written_in_target_dir(mocker: MockerFixture) -> None:
+    mkstemp = mocker.spy(tempfile, "mkstemp")
+
+    module_path = fixtures_dir / "module1"
+    WheelBuilder.make(Factory().create_poetry(module_path))
+
+    assert mkstemp.call_args.kwargs["dir"] == module_path / "dist"
+    assert not mkstemp.spy_return[1].endswith(".whl")
+    assert [p.name for p in (module_path / "dist").iterdir()] == [
+        "module1-0.1-py2.py3-none-any.whl"
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No POSIX permissions on Windows")
+def test_wheel_file_permissions() -> None:
+    module_path = fixtures_dir / "module1"
+    WheelBuilder.make(Factory().create_poetry(module_path))
+
+    whl = module_path / "dist" / "module1-0.1-py2.py3-none-any.whl"
+
+    assert stat.S_IMODE(whl.stat().st_mode) == 0o644
+
+
+def test_failed_build_removes_temporary_wheel(mocker: MockerFixture) -> None:
+    mocker.patch.object(WheelBuilder, "_copy_module", side_effect=RuntimeError)
+
+    module_path = fixtures_dir / "module1"
+    with pytest.raises(RuntimeError):
+        WheelBuilder.make(Factory().create_poetry(module_path))
+
+    assert list((module_path / "dist").iterdir()) == []
+
+
+def test_failed_rename_removes_temporary_wheel(mocker: MockerFixture) -> None:
+    mocker.patch("os.replace", side_effect=PermissionError)
+
+    module_path = fixtures_dir / "module1"
+    with pytest.raises(PermissionError):
+        WheelBuilder.make(Factory().create_poetry(module_path))
+
+    assert list((module_path / "dist").iterdir()) == []
+
+
 @pytest.mark.parametrize("in_venv_build", [True, False])
 def test_tag(in_venv_build: bool, mocker: MockerFixture) -> None:
     """Tests that tag returns a valid tag if a build script is used,
@@ -373,3 +477,14 @@ def test_tag(in_venv_build: bool, mocker: MockerFixture) -> None:
         get_sys_tags_spy.assert_not_called()
     else:
         get_sys_tags_spy.assert_called()
+
+
+def test_tag_is_computed_once(mocker: MockerFixture) -> None:
+    root = fixtures_dir / "extended"
+    builder = WheelBuilder(Factory().create_poetry(root))
+
+    sys_tags_spy = mocker.spy(packaging.tags, "sys_tags")
+
+    assert builder.tag == builder.tag
+    assert builder.wheel_filename.endswith(f"-{builder.tag}.whl")
+    assert sys_tags_spy.call_count == 1